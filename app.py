@@ -1,24 +1,21 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import matplotlib.pyplot as plt
 import numpy as np
-from fpdf import FPDF
+import csv
+import io
 import os
-import qrcode
-
-try:
-    from streamlit_webrtc import webrtc_streamer, AudioProcessorBase
-except:
-    webrtc_streamer = None
 
 # ---------------- MBTI Mapping ---------------- #
+MBTI_AXES = (
+    ("Extraversion", ("I", "E")),
+    ("Openness", ("S", "N")),
+    ("Agreeableness", ("T", "F")),
+    ("Conscientiousness", ("P", "J"))
+)
+
 def map_to_mbti(traits):
-    E = 'E' if traits['Extraversion'] > 50 else 'I'
-    N = 'N' if traits['Openness'] > 50 else 'S'
-    F = 'F' if traits['Agreeableness'] > 50 else 'T'
-    J = 'J' if traits['Conscientiousness'] > 50 else 'P'
-    return E + N + F + J
+    return "".join(letters[traits[trait] > 50] for trait, letters in MBTI_AXES)
 
 mbti_stats = {
     "INFJ": 1.5, "ENFJ": 2.5, "INTJ": 2, "ENTJ": 2,
@@ -70,11 +67,17 @@ user_name = st.text_input("Enter your name:")
 user_input = st.text_area("Enter a paragraph about yourself:")
 
 # ---------------- Voice Input (Optional) ---------------- #
+try:
+    from streamlit_webrtc import webrtc_streamer
+except ImportError:
+    webrtc_streamer = None
+
 if webrtc_streamer:
     st.markdown("🎤 Or record your voice input below:")
     webrtc_streamer(key="example")
 
 # ---------------- Dummy ML Model ---------------- #
+@st.cache_data(show_spinner=False)
 def predict_personality(text):
     return {
         "Openness": 70,
@@ -85,49 +88,44 @@ def predict_personality(text):
     }
 
 # ---------------- Explanation Generator ---------------- #
-def generate_explanations(traits, lang="English"):
-    messages = []
-    for trait, value in traits.items():
-        if lang == "English":
-            if trait == "Openness":
-                msg = f"You are {value}% open to new experiences."
-            elif trait == "Conscientiousness":
-                msg = f"You show {value}% responsibility and discipline."
-            elif trait == "Extraversion":
-                msg = f"You exhibit {value}% sociability."
-            elif trait == "Agreeableness":
-                msg = f"You reflect {value}% kindness and cooperation."
-            elif trait == "Neuroticism":
-                msg = f"You have {value}% emotional instability."
-        else:
-            if trait == "Openness":
-                msg = f"आप नई चीज़ों के लिए {value}% खुले विचारों वाले हैं।"
-            elif trait == "Conscientiousness":
-                msg = f"आप {value}% जिम्मेदार और अनुशासित हैं।"
-            elif trait == "Extraversion":
-                msg = f"आप {value}% मिलनसार हैं।"
-            elif trait == "Agreeableness":
-                msg = f"आप {value}% दयालु और सहयोगी हैं।"
-            elif trait == "Neuroticism":
-                msg = f"आपमें {value}% भावनात्मक चञ्चालता है।"
-        messages.append(msg)
-    return messages
+EXPLANATION_TEMPLATES = {
+    "English": {
+        "Openness": "You are {value}% open to new experiences.",
+        "Conscientiousness": "You show {value}% responsibility and discipline.",
+        "Extraversion": "You exhibit {value}% sociability.",
+        "Agreeableness": "You reflect {value}% kindness and cooperation.",
+        "Neuroticism": "You have {value}% emotional instability."
+    },
+    "Hindi": {
+        "Openness": "आप नई चीज़ों के लिए {value}% खुले विचारों वाले हैं।",
+        "Conscientiousness": "आप {value}% जिम्मेदार और अनुशासित हैं।",
+        "Extraversion": "आप {value}% मिलनसार हैं।",
+        "Agreeableness": "आप {value}% दयालु और सहयोगी हैं।",
+        "Neuroticism": "आपमें {value}% भावनात्मक चञ्चालता है।"
+    }
+}
+
+@st.cache_data(show_spinner=False)
+def generate_explanations(trait_items, lang="English"):
+    templates = EXPLANATION_TEMPLATES.get(lang, EXPLANATION_TEMPLATES["Hindi"])
+    return [templates[trait].format(value=value) for trait, value in trait_items]
 
 # ---------------- Job Role Suggestions ---------------- #
+ROLES_BY_TRAIT = {
+    "Openness": ("Graphic Designer", "Writer", "Product Designer", "Innovation Strategist"),
+    "Conscientiousness": ("Project Manager", "Data Analyst", "Quality Assurance", "Accountant"),
+    "Extraversion": ("Sales Executive", "HR Manager", "Public Relations Officer", "Event Coordinator"),
+    "Agreeableness": ("Teacher", "Psychologist", "Nurse", "Social Worker"),
+    "Neuroticism": ("Researcher", "Doctor", "Engineer", "Software Developer")
+}
+
+DEFAULT_ROLES = ("Consultant", "Generalist", "Content Creator")
+
 def suggest_roles(traits):
     dominant_trait = max(traits, key=traits.get)
-    if dominant_trait == "Openness":
-        return ["Graphic Designer", "Writer", "Product Designer", "Innovation Strategist"]
-    elif dominant_trait == "Conscientiousness":
-        return ["Project Manager", "Data Analyst", "Quality Assurance", "Accountant"]
-    elif dominant_trait == "Extraversion":
-        return ["Sales Executive", "HR Manager", "Public Relations Officer", "Event Coordinator"]
-    elif dominant_trait == "Agreeableness":
-        return ["Teacher", "Psychologist", "Nurse", "Social Worker"]
-    elif dominant_trait == "Neuroticism" and traits["Neuroticism"] < 40:
-        return ["Researcher", "Doctor", "Engineer", "Software Developer"]
-    else:
-        return ["Consultant", "Generalist", "Content Creator"]
+    if dominant_trait == "Neuroticism" and traits["Neuroticism"] >= 40:
+        return DEFAULT_ROLES
+    return ROLES_BY_TRAIT.get(dominant_trait, DEFAULT_ROLES)
 
 # ---------------- Quote Generator ---------------- #
 def generate_tip(trait):
@@ -141,78 +139,101 @@ def generate_tip(trait):
     return tips.get(trait, "Be your best self!")
 
 # ---------------- Chart ---------------- #
-def show_chart(traits):
-    labels = list(traits.keys())
-    values = list(traits.values())
-    angles = np.linspace(0, 2 * np.pi, len(labels), endpoint=False).tolist()
-    values += values[:1]
-    angles += angles[:1]
-
-    fig, ax = plt.subplots(figsize=(6, 6), subplot_kw=dict(polar=True))
-    ax.fill(angles, values, color='skyblue', alpha=0.4)
-    ax.plot(angles, values, color='blue', linewidth=2)
-    ax.set_yticklabels([])
-    ax.set_xticks(angles[:-1])
-    ax.set_xticklabels(labels)
-    st.pyplot(fig)
+@st.cache_data(show_spinner=False)
+def build_radar(trait_items):
+    import plotly.graph_objects as go
+
+    labels, values = zip(*trait_items)
+    values = np.asarray(values, dtype=np.float64)
+
+    fig = go.Figure(go.Scatterpolar(
+        r=np.concatenate([values, values[:1]]),
+        theta=labels + labels[:1],
+        fill='toself',
+        fillcolor='rgba(135, 206, 235, 0.4)',
+        line=dict(color='blue', width=2)
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, showticklabels=False, range=[0, 100])),
+        showlegend=False,
+        width=500,
+        height=500
+    )
+    return fig
+
+def show_chart(trait_items):
+    st.plotly_chart(build_radar(trait_items))
 
 # ---------------- PDF Generator ---------------- #
-def generate_pdf_report(name, traits, explanations, roles, quotes, mbti, percent, famous):
+def generate_pdf_report(name, now, score_lines, explanations, roles, quotes, mbti, percent, famous):
+    from fpdf import FPDF, XPos, YPos
+    import qrcode
+
     pdf = FPDF()
     pdf.add_page()
-    pdf.set_font("Arial", size=14)
-    pdf.cell(200, 10, txt="Personality Mix Analyzer Report", ln=True, align='C')
+    pdf.set_font("Helvetica", size=14)
+    pdf.cell(200, 10, text="Personality Mix Analyzer Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
     pdf.ln(10)
-    pdf.cell(200, 10, txt=f"Name: {name}", ln=True)
-    pdf.cell(200, 10, txt=f"Date: {datetime.now().strftime('%d %B %Y')}", ln=True)
-
-    pdf.ln(5)
-    for trait, score in traits.items():
-        pdf.cell(200, 10, txt=f"{trait}: {score}%", ln=True)
-
-    pdf.ln(5)
-    pdf.cell(200, 10, txt=f"MBTI Personality: {mbti}", ln=True)
-    pdf.cell(200, 10, txt=f"Global Population: {percent}%", ln=True)
-    pdf.cell(200, 10, txt=f"Famous Personality: {famous}", ln=True)
-
-    pdf.ln(5)
-    pdf.cell(200, 10, txt="Trait Explanations:", ln=True)
-    for line in explanations:
-        safe_line = line.encode('latin-1', 'ignore').decode('latin-1')
-        pdf.multi_cell(180, 10, txt=safe_line)
-
-    pdf.ln(5)
-    pdf.cell(200, 10, txt="Suggested Roles:", ln=True)
-    for role in roles:
-        safe_role = role.encode('latin-1', 'ignore').decode('latin-1')
-        pdf.cell(200, 10, txt=f"- {safe_role}", ln=True)
-
-    pdf.ln(5)
-    pdf.cell(200, 10, txt="Tips & Quotes:", ln=True)
-    for quote in quotes:
-        safe_quote = quote.encode('latin-1', 'ignore').decode('latin-1')
-        pdf.multi_cell(180, 10, txt=f"- {safe_quote}")
-
-    qr = qrcode.make(f"https://your-resume-link-or-summary.com/{name}")
-    qr_path = f"{name}_qr.png"
-    qr.save(qr_path)
-    pdf.image(qr_path, x=80, y=pdf.get_y()+5, w=50)
-
-    path = f"{name}_personality_report.pdf"
-    pdf.output(path)
-    os.remove(qr_path)
-    return path
+
+    summary = "\n".join([
+        f"Name: {name}",
+        f"Date: {now.strftime('%d %B %Y')}",
+        "",
+        *score_lines,
+        "",
+        f"MBTI Personality: {mbti}",
+        f"Global Population: {percent}%",
+        f"Famous Personality: {famous}",
+    ])
+    pdf.multi_cell(180, 10, text=summary.encode('latin-1', 'ignore').decode('latin-1'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    details = "\n".join([
+        "",
+        "Trait Explanations:",
+        *explanations,
+        "",
+        "Suggested Roles:",
+        *(f"- {role}" for role in roles),
+        "",
+        "Tips & Quotes:",
+        *(f"- {quote}" for quote in quotes),
+    ])
+    pdf.multi_cell(180, 10, text=details.encode('latin-1', 'ignore').decode('latin-1'), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    qr_buffer = io.BytesIO()
+    qrcode.make(f"https://your-resume-link-or-summary.com/{name}").save(qr_buffer, format="PNG")
+    qr_buffer.seek(0)
+    pdf.image(qr_buffer, x=80, y=pdf.get_y()+5, w=50)
+
+    return bytes(pdf.output())
 
 # ---------------- History ---------------- #
-def save_result(name, traits):
-    df = pd.DataFrame([{"Name": name, "Date": datetime.now(), **traits}])
-    if os.path.exists("history.csv"):
-        df.to_csv("history.csv", mode='a', header=False, index=False)
-    else:
-        df.to_csv("history.csv", index=False)
+def save_result(name, traits, now):
+    write_header = not os.path.exists("history.csv")
+    with open("history.csv", "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if write_header:
+            writer.writerow(["Name", "Date", *traits])
+        writer.writerow([name, now, *traits.values()])
+
+@st.cache_data(ttl=30)
+def tail_history(path, mtime, k=200):
+    # Read backwards from EOF until we hold the last k rows, then parse only those
+    with open(path, "rb") as f:
+        header = f.readline()
+        body_start = f.tell()
+        pos = f.seek(0, os.SEEK_END)
+        tail = b""
+        while pos > body_start and tail.count(b"\n") <= k:
+            step = min(8192, pos - body_start)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+    rows = b"".join(tail.splitlines(keepends=True)[-k:])
+    return pd.read_csv(io.BytesIO(header + rows), engine="pyarrow").iloc[::-1]
 
 if show_history and os.path.exists("history.csv"):
-    history_df = pd.read_csv("history.csv")
+    history_df = tail_history("history.csv", os.path.getmtime("history.csv"))
     st.subheader("Past Predictions")
     st.dataframe(history_df)
 
@@ -221,10 +242,16 @@ if st.button("Analyze Personality"):
     if user_input.strip() == "" or user_name.strip() == "":
         st.warning("Please enter both your name and a paragraph.")
     else:
+        now = datetime.now()
         trait_mix = predict_personality(user_input)
-        explanations = generate_explanations(trait_mix, language)
+        trait_items = tuple(trait_mix.items())
+        tips, score_lines = [], []
+        for trait, score in trait_items:
+            tips.append(generate_tip(trait))
+            score_lines.append(f"{trait}: {score}%")
+
+        explanations = generate_explanations(trait_items, language)
         roles = suggest_roles(trait_mix)
-        tips = [generate_tip(trait) for trait in trait_mix]
 
         mbti_type = map_to_mbti(trait_mix)
         mbti_percent = mbti_stats.get(mbti_type, "N/A")
@@ -234,8 +261,7 @@ if st.button("Analyze Personality"):
         st.balloons()
 
         st.subheader("Trait Breakdown:")
-        for e in explanations:
-            st.markdown(f"- {e}")
+        st.markdown("\n".join(f"- {e}" for e in explanations))
 
         st.markdown("### MBTI Personality Match:")
         st.markdown(f"🧠 You align with **{mbti_type}** personality.")
@@ -243,19 +269,16 @@ if st.button("Analyze Personality"):
         st.markdown(f"🌟 Famous Match: **{famous_person}**")
 
         st.markdown("### Suitable Career Roles:")
-        for r in roles:
-            st.markdown(f"✅ {r}")
+        st.markdown("\n\n".join(f"✅ {r}" for r in roles))
 
         st.markdown("### Personal Tips:")
-        for t in tips:
-            st.markdown(f"👉 {t}")
+        st.markdown("\n\n".join(f"👉 {t}" for t in tips))
 
-        show_chart(trait_mix)
-        save_result(user_name, trait_mix)
+        show_chart(trait_items)
+        save_result(user_name, trait_mix, now)
 
-        path = generate_pdf_report(user_name, trait_mix, explanations, roles, tips, mbti_type, mbti_percent, famous_person)
-        with open(path, "rb") as f:
-            st.download_button("Download Report (PDF)", data=f, file_name=path, mime="application/pdf")
+        pdf_bytes = generate_pdf_report(user_name, now, score_lines, explanations, roles, tips, mbti_type, mbti_percent, famous_person)
+        st.download_button("Download Report (PDF)", data=pdf_bytes, file_name=f"{user_name}_personality_report.pdf", mime="application/pdf")
 
 # ---------------- Footer ---------------- #
 st.markdown("---")